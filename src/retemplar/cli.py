@@ -11,22 +11,56 @@ Commands:
 
 from __future__ import annotations
 
-import json
-import traceback
 from pathlib import Path
-from typing import List
 
 import typer
-from rich.console import Console
 
-from .core import RetemplarCore
-from .lockfile import LockfileError
+# Console is import-heavy (rich pulls pygments etc.); defer until first print.
+_console = None
 
-app = typer.Typer(
-    add_completion=False,
-    help="Fleet-scale repository templating (RAT).",
-)
-console = Console()
+
+def _get_console():
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+# Commands register here at import (cheap list append); the Typer app and
+# its Click machinery are only built on first use.
+_COMMANDS: list = []
+_app = None
+
+
+def _command(fn):
+    _COMMANDS.append(fn)
+    return fn
+
+
+def _get_app() -> typer.Typer:
+    global _app
+    if _app is None:
+        _app = typer.Typer(
+            add_completion=False,
+            help="Fleet-scale repository templating (RAT).",
+        )
+        _app.callback()(main)
+        for fn in _COMMANDS:
+            _app.command()(fn)
+    return _app
+
+
+def __getattr__(name: str):
+    # Keep `from retemplar.cli import app` (entry point, tests) and
+    # `... import console` working without paying their construction cost
+    # on plain `import retemplar.cli`.
+    if name == "app":
+        return _get_app()
+    if name == "console":
+        return _get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ----------------------------
@@ -38,20 +72,33 @@ class Ctx:
     def __init__(self, repo_path: Path, verbose: bool):
         self.repo_path = repo_path
         self.verbose = verbose
+        self._core = None
+
+    def core(self):
+        """Construct RetemplarCore once per invocation and reuse it.
+
+        --repo is validated/resolved here rather than eagerly in the Typer
+        option, so version/--help never stat the filesystem.
+        """
+        if self._core is None:
+            if not self.repo_path.is_dir():
+                raise typer.BadParameter(
+                    f"Repository path does not exist: {self.repo_path}",
+                    param_hint="--repo",
+                )
+            self.repo_path = self.repo_path.resolve()
+            from .core import RetemplarCore
+
+            self._core = RetemplarCore(self.repo_path)
+        return self._core
 
 
-@app.callback()
 def main(
     ctx: typer.Context,
     repo: Path = typer.Option(
         Path("."),
         "--repo",
         "-R",
-        exists=True,
-        file_okay=False,
-        dir_okay=True,
-        readable=True,
-        resolve_path=True,
         help="Path to the target repository (default: current directory).",
     ),
     verbose: bool = typer.Option(
@@ -66,50 +113,93 @@ def main(
 
 
 def _print_json(data) -> None:
+    import sys
+
+    # Piped output (CI, jq) gets plain JSON: no ANSI bytes, no rich
+    # re-parse/highlight pass.
+    if not sys.stdout.isatty():
+        import json
+
+        sys.stdout.write(json.dumps(data, indent=2) + "\n")
+        return
+    console = _get_console()
     try:
         console.print_json(data=data)
     except Exception:
+        import json
+
         console.print(json.dumps(data, indent=2))
 
 
 def _handle_error(e: Exception, verbose: bool) -> None:
+    from .lockfile import LockfileError
+
+    if isinstance(e, typer.BadParameter):
+        raise e  # let Click render usage errors with proper formatting
+
+    console = _get_console()
     if isinstance(e, LockfileError):
         console.print(f"[bold red]Error:[/bold red] {e}")
     else:
         console.print(f"[bold red]Unexpected error:[/bold red] {e}")
     if verbose:
+        import traceback
+
         console.print("[dim]" + traceback.format_exc() + "[/dim]")
     raise typer.Exit(1)
 
 
-def _parse_render_opts(opts: List[str]) -> List[dict]:
+# Compiled on first use; one C-level match per spec replaces the Python-level
+# partition/branch dance. The (?!re:) lookahead keeps a malformed 're:FOO'
+# (no replacement) from being silently read as a literal rule.
+_SPEC_RE = None
+
+
+def _parse_render_opts(opts: list[str]) -> list[dict]:
     """Parse --render specs like FROM:TO or re:PATTERN:TO"""
-    rules: List[dict] = []
+    import re
+
+    from .utils.fs_utils import compile_render_pattern
+
+    global _SPEC_RE
+    if _SPEC_RE is None:
+        _SPEC_RE = re.compile(
+            r"re:(?P<pat>[^:]*):(?P<rep>.*)|(?P<lpat>(?!re:)[^:]*):(?P<lrep>.*)",
+        )
+
+    rules: list[dict] = []
     for spec in opts:
-        if spec.startswith("re:"):
-            body = spec[3:]
-            if ":" not in body:
+        m = _SPEC_RE.fullmatch(spec)
+        if m is None:
+            if spec.startswith("re:"):
                 raise typer.BadParameter(
                     f"Regex rule must be 're:PATTERN:REPLACEMENT': {spec}",
                 )
-            pattern, replacement = body.split(":", 1)
+            raise typer.BadParameter(
+                f"Render rule must be 'FROM:TO' or 're:PATTERN:TO': {spec}",
+            )
+        pattern = m["pat"]
+        if pattern is not None:
+            # Compile now: rejects bad patterns at adopt time and warms the
+            # shared cache so plan/apply reuse the compiled object.
+            try:
+                compile_render_pattern(pattern)
+            except re.error as e:
+                raise typer.BadParameter(
+                    f"Invalid regex in render rule '{spec}': {e}",
+                )
             rules.append(
                 {
                     "pattern": pattern,
-                    "replacement": replacement,
+                    "replacement": m["rep"],
                     "literal": False,
                 },
             )
         else:
-            if ":" not in spec:
-                raise typer.BadParameter(
-                    f"Render rule must be 'FROM:TO' or 're:PATTERN:TO': {spec}",
-                )
-            pattern, replacement = spec.split(":", 1)
             rules.append(
                 {
-                    "pattern": pattern,
-                    "replacement": replacement,
+                    "pattern": m["lpat"],
+                    "replacement": m["lrep"],
                     "literal": True,
                 },
             )
@@ -121,7 +211,7 @@ def _parse_render_opts(opts: List[str]) -> List[dict]:
 # ----------------------------
 
 
-@app.command()
+@_command
 def adopt(
     ctx: typer.Context,
     template: str = typer.Option(
@@ -130,19 +220,19 @@ def adopt(
         "-t",
         help="Template source, e.g. 'rat:./template-dir@v0'.",
     ),
-    managed: List[str] = typer.Option(
+    managed: list[str] = typer.Option(
         [],
         "--managed",
         "-m",
         help="Glob(s) or path(s) to manage. Repeatable.",
     ),
-    ignore: List[str] = typer.Option(
+    ignore: list[str] = typer.Option(
         [],
         "--ignore",
         "-i",
         help="Glob(s) or path(s) to ignore. Repeatable.",
     ),
-    render: List[str] = typer.Option(
+    render: list[str] = typer.Option(
         [],
         "--render",
         "-r",
@@ -152,22 +242,24 @@ def adopt(
     """Attach the repo to a template/ref and create `.retemplar.lock`."""
     try:
         render_rules = _parse_render_opts(render)
-        core = RetemplarCore(ctx.obj.repo_path)
+        console = _get_console()
+        core = ctx.obj.core()
         core.adopt_template(
             template,
             managed_paths=managed,
             ignore_paths=ignore,
             render_rules=render_rules,
         )
-        console.print(f"[green]✓[/green] Adopted template: {template}")
+        # One render pass instead of two sequential prints.
         console.print(
+            f"[green]✓[/green] Adopted template: {template}\n"
             f"[dim]Created .retemplar.lock in {ctx.obj.repo_path}[/dim]",
         )
     except Exception as e:
         _handle_error(e, ctx.obj.verbose)
 
 
-@app.command()
+@_command
 def plan(
     ctx: typer.Context,
     to: str = typer.Option(
@@ -178,14 +270,13 @@ def plan(
 ):
     """Preview structural upgrade plan (cheap, no file diffs)."""
     try:
-        core = RetemplarCore(ctx.obj.repo_path)
-        plan_result = core.plan_upgrade(target_ref=to)
+        plan_result = ctx.obj.core().plan_upgrade(target_ref=to)
         _print_json(plan_result)
     except Exception as e:
         _handle_error(e, ctx.obj.verbose)
 
 
-@app.command()
+@_command
 def apply(
     ctx: typer.Context,
     to: str = typer.Option(
@@ -201,26 +292,34 @@ def apply(
 ):
     """Apply template changes (with content merge)."""
     try:
-        core = RetemplarCore(ctx.obj.repo_path)
+        console = _get_console()
+        core = ctx.obj.core()
         if dry_run:
             console.print("[yellow][dry-run][/yellow] Previewing changes...")
             result = core.apply_changes(
                 target_ref=to,
                 dry_run=dry_run,
             )  # but don’t write
+            if result.get("lock") is not None:
+                # pydantic models aren't JSON-serializable; dump for printing
+                result["lock"] = result["lock"].model_dump(
+                    by_alias=True,
+                    exclude_none=True,
+                )
             _print_json(result)
             return
         result = core.apply_changes(target_ref=to)
-        console.print("[green]✓[/green] Applied template changes")
+        lines = ["[green]✓[/green] Applied template changes"]
         if result.get("conflicts_resolved", 0) > 0:
-            console.print(
+            lines.append(
                 f"[yellow]![/yellow] {result['conflicts_resolved']} file(s) contain conflict markers",
             )
+        console.print("\n".join(lines))
     except Exception as e:
         _handle_error(e, ctx.obj.verbose)
 
 
-@app.command()
+@_command
 def drift(
     ctx: typer.Context,
     as_json: bool = typer.Option(
@@ -230,10 +329,10 @@ def drift(
     ),
 ):
     """Report drift between the lockfile baseline and current repo (stub)."""
+    console = _get_console()
     console.print("Drift detection is a work in progress.", style="white on red")
     try:
-        core = RetemplarCore(ctx.obj.repo_path)
-        drift_result = core.detect_drift()
+        drift_result = ctx.obj.core().detect_drift()
         if as_json:
             _print_json(drift_result)
         else:
@@ -243,18 +342,65 @@ def drift(
         _handle_error(e, ctx.obj.verbose)
 
 
-@app.command()
+@_command
 def version() -> None:
     """Print retemplar version."""
-    try:
-        from importlib.metadata import version as _pkg_version
+    from . import __version__
 
-        typer.echo(f"retemplar {_pkg_version('retemplar')}")
-    except Exception:
-        typer.echo("retemplar 0.0.1")
+    typer.echo(f"retemplar {__version__}")
+
+
+# Hand-maintained mirror of the Typer top-level help; lets `retemplar --help`
+# return without building the app. Update when commands/options change.
+_STATIC_HELP_TEXT = """\
+Usage: retemplar [OPTIONS] COMMAND [ARGS]...
+
+  Fleet-scale repository templating (RAT).
+
+Options:
+  -R, --repo <path>  Path to the target repository (default: current directory).
+  -v, --verbose      Enable verbose logs.
+  --help             Show this message and exit.
+
+Commands:
+  adopt    Attach the repo to a template/ref and create `.retemplar.lock`.
+  plan     Preview structural upgrade plan (cheap, no file diffs).
+  apply    Apply template changes (with content merge).
+  drift    Report drift between the lockfile baseline and current repo (stub).
+  version  Print retemplar version.\
+"""
 
 
 def _main() -> None:
+    import sys
+
+    # Fast paths: help and version never need the Typer/Click machinery.
+    argv = sys.argv[1:]
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_STATIC_HELP_TEXT)
+        return
+    if argv == ["version"]:
+        from . import __version__
+
+        print(f"retemplar {__version__}")
+        return
+
+    app = _get_app()
+
+    # Typer builds a Click parser for every registered command on dispatch.
+    # Sniff argv for the requested subcommand and prune the rest so e.g.
+    # `retemplar version` never wires up adopt/plan/apply/drift. Keeping a
+    # command whose name merely appears as an option value is harmless (we
+    # only over-keep), and no match at all (--help, typos) keeps everything.
+    argv_tokens = {a for a in sys.argv[1:] if not a.startswith("-")}
+    if argv_tokens:
+        wanted = [
+            c
+            for c in app.registered_commands
+            if (c.name or c.callback.__name__) in argv_tokens
+        ]
+        if wanted:
+            app.registered_commands = wanted
     app()
 
 
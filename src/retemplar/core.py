@@ -2,9 +2,10 @@
 Core retemplar operations (MVP).
 """
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import logging
 
@@ -17,13 +18,29 @@ from .utils import merge_utils
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlanItem:
     path: str
     strategy: str  # "enforce" | "preserve" | "merge"
     kind: str  # "create" | "overwrite" | "edit" | "delete" | "keep"
     note: str = ""
     had_conflict: bool = False
+    matched_rule_path: str = ""
+
+
+@dataclass(slots=True)
+class _PlanContext:
+    """Walk results and parsed inputs shared between plan and apply."""
+
+    lock: Any
+    target_src: Any
+    tpl_root: Path
+    tpl_files: frozenset
+    repo_files: frozenset
+    candidate_files: List[str]
+    # rel -> rendered template text, filled by the plan's merge probes so
+    # apply never re-reads/re-renders the template side of an edit.
+    rendered_theirs: Dict[str, str] = field(default_factory=dict)
 
 
 class RetemplarCore:
@@ -67,6 +84,13 @@ class RetemplarCore:
 
     def plan_upgrade(self, target_ref: str) -> Dict[str, Any]:
         """Compute a human-readable plan. 2-way semantics for now."""
+        return self._plan_from_context(
+            self._build_plan_context(target_ref),
+            target_ref,
+        )
+
+    def _build_plan_context(self, target_ref: str) -> _PlanContext:
+        """Walk both trees once and bundle everything plan/apply share."""
         if not self.lockfile_manager.exists():
             raise LockfileNotFoundError(
                 "No .retemplar.lock found. Run 'retemplar adopt' first.",
@@ -75,28 +99,75 @@ class RetemplarCore:
         lock = self.lockfile_manager.read()
         target_src = self.lockfile_manager._parse_template_ref(target_ref)  # type: ignore[attr-defined]
         tpl_root = fs_utils.resolve_template_path(target_src.repo)
+        ignore_patterns = lock.ignore_paths or []
+
+        # No managed rules means no candidate can ever match — return an
+        # empty context without walking either tree.
+        if not lock.managed_paths:
+            return _PlanContext(
+                lock=lock,
+                target_src=target_src,
+                tpl_root=tpl_root,
+                tpl_files=frozenset(),
+                repo_files=frozenset(),
+                candidate_files=[],
+            )
 
-        # Template file set (relative posix)
-        tpl_files = set(fs_utils.list_files(tpl_root))
-        # Repo file set
-        repo_files = set(fs_utils.list_files(self.repo_path))
+        # File sets (relative posix); dir-glob ignores prune the walks
+        tpl_files = frozenset(fs_utils.iter_files(tpl_root, ignore_patterns))
+        repo_files = frozenset(
+            fs_utils.iter_files(self.repo_path, ignore_patterns),
+        )
 
-        # Union for consideration
-        candidate_files = sorted(tpl_files | repo_files)
+        return _PlanContext(
+            lock=lock,
+            target_src=target_src,
+            tpl_root=tpl_root,
+            tpl_files=tpl_files,
+            repo_files=repo_files,
+            candidate_files=sorted(tpl_files | repo_files),
+        )
+
+    def _plan_from_context(
+        self,
+        ctx: _PlanContext,
+        target_ref: str,
+    ) -> Dict[str, Any]:
+        lock = ctx.lock
+        tpl_root = ctx.tpl_root
+        tpl_files = ctx.tpl_files
+        repo_files = ctx.repo_files
+        candidate_files = ctx.candidate_files
+
+        # Hoist loop invariants and memoize rule lookups for this call; the
+        # same handful of patterns is tested against every candidate file.
+        ignore_patterns = lock.ignore_paths or []
+        managed_rules = lock.managed_paths or []
+        render_rules = getattr(lock, "render_rules", None)
+
+        exact_rules, glob_rules = fs_utils.partition_rules(managed_rules)
+        exact_ignores, glob_ignores = fs_utils.partition_ignores(
+            ignore_patterns,
+        )
+        ignore_re = fs_utils.compile_ignore_globs(glob_ignores)
+        glob_rule_for = fs_utils.compile_rule_matcher(glob_rules)
+        compiled_rules = fs_utils.compile_rules(render_rules)
 
         items: List[PlanItem] = []
         conflicts = 0
+        block_events: List[Dict[str, Any]] = []
+        repo_p_join = self.repo_path.joinpath
+        # Merge-candidate probes are deferred and (for larger plans) run on
+        # a thread pool: each probe is two reads, and the GIL is released
+        # during the syscalls, so cold-cache latency overlaps.
+        merge_probes: List[tuple] = []  # (items index, rel)
 
         for rel in candidate_files:
-            if fs_utils.is_ignored(
-                rel,
-                getattr(lock, "ignore_paths", []) or [],
+            if rel in exact_ignores or (
+                ignore_re is not None and ignore_re.match(rel)
             ):
                 continue
-            rule = fs_utils.best_rule(
-                rel,
-                getattr(lock, "managed_paths", []) or [],
-            )
+            rule = exact_rules.get(rel) or glob_rule_for(rel)
             if not rule:
                 continue
 
@@ -104,102 +175,115 @@ class RetemplarCore:
             in_tpl = rel in tpl_files
             in_repo = rel in repo_files
 
+            # Every candidate is in at least one set, so each branch below
+            # yields exactly one (kind, note) pair.
             if strategy == "preserve":
                 if in_tpl and not in_repo:
-                    items.append(
-                        PlanItem(
-                            rel,
-                            strategy,
-                            "create",
-                            "template will create (preserve local thereafter)",
-                        ),
+                    kind, note = (
+                        "create",
+                        "template will create (preserve local thereafter)",
                     )
                 else:
-                    items.append(
-                        PlanItem(
-                            rel,
-                            strategy,
-                            "keep",
-                            "preserve local content",
-                        ),
-                    )
-                continue
-
-            if strategy == "enforce":
+                    kind, note = "keep", "preserve local content"
+            elif strategy == "enforce":
                 if in_tpl and in_repo:
-                    items.append(
-                        PlanItem(
-                            rel,
-                            strategy,
-                            "overwrite",
-                            "template will overwrite local file",
-                        ),
-                    )
-                elif in_tpl and not in_repo:
-                    items.append(
-                        PlanItem(
-                            rel,
-                            strategy,
-                            "create",
-                            "template will create file",
-                        ),
+                    kind, note = (
+                        "overwrite",
+                        "template will overwrite local file",
                     )
-                elif not in_tpl and in_repo:
-                    items.append(
-                        PlanItem(
-                            rel,
-                            strategy,
-                            "delete",
-                            "template removed file; will delete locally",
-                        ),
-                    )
-                continue
-
-            # strategy == "merge"
-            if in_tpl and in_repo:  # Plan for actual file diffs
-                ours = fs_utils.read_text(self.repo_path / rel)
-                theirs = fs_utils.apply_render_rules_text(
-                    fs_utils.read_text(tpl_root / rel) or "",
-                    getattr(lock, "render_rules", None),
-                )
-                if ours is None or theirs is None:
-                    had_conflict = True  # binary/unreadable
+                elif in_tpl:
+                    kind, note = "create", "template will create file"
                 else:
-                    had_conflict = ours != theirs
-                items.append(
-                    PlanItem(
-                        rel,
-                        strategy,
-                        "edit",
-                        "merge changes",
-                        had_conflict=had_conflict,
-                    ),
-                )
-                if had_conflict:
-                    conflicts += 1
-            elif in_tpl and not in_repo:
-                items.append(
-                    PlanItem(
-                        rel,
-                        strategy,
-                        "create",
-                        "template adds file; adopt it",
-                    ),
-                )
-            elif not in_tpl and in_repo:
-                items.append(
-                    PlanItem(
-                        rel,
-                        strategy,
+                    kind, note = (
                         "delete",
-                        "template removed file; will delete",
-                    ),
+                        "template removed file; will delete locally",
+                    )
+            else:  # merge
+                if in_tpl and in_repo:
+                    kind, note = "edit", "merge changes"
+                elif in_tpl:
+                    kind, note = "create", "template adds file; adopt it"
+                else:
+                    kind, note = "delete", "template removed file; will delete"
+
+            items.append(
+                PlanItem(
+                    rel,
+                    strategy,
+                    kind,
+                    note,
+                    matched_rule_path=rule.path,
+                ),
+            )
+            if strategy == "merge" and kind == "edit":
+                merge_probes.append((len(items) - 1, rel))
+
+            # Block-protection preview, fused into this pass: every ruled
+            # repo file is visited here anyway, so no second walk/scan.
+            if in_repo:
+                s = fs_utils.read_text(repo_p_join(rel))
+                if s is not None:
+                    blocks = find_ignore_blocks(s)
+                    if blocks:
+                        block_events.append(
+                            {
+                                "file": rel,
+                                "blocks": [
+                                    {
+                                        "id": bid,
+                                        "start": span.start + 1,
+                                        "end": span.end + 1,
+                                    }
+                                    for bid, span in blocks.items()
+                                ],
+                            },
+                        )
+
+        tpl_p_join = tpl_root.joinpath
+
+        def _diff_one(rel: str) -> bool:
+            repo_p = repo_p_join(rel)
+            tpl_p = tpl_p_join(rel)
+            if not render_rules:
+                # Metadata first: different sizes means different bytes,
+                # and (utf-8 being injective) different text — conflict
+                # without reading either side.
+                if repo_p.stat().st_size != tpl_p.stat().st_size:
+                    return True
+                # Same size: compare over mmap — the common no-op-upgrade
+                # case never copies, decodes, or renders anything.
+                if fs_utils.files_equal(repo_p, tpl_p):
+                    return False
+            ours_b = repo_p.read_bytes()
+            theirs_b = tpl_p.read_bytes()
+            if not render_rules and ours_b == theirs_b:
+                return False  # unreachable in practice; kept as a guard
+            ours = fs_utils.decode_text(ours_b)
+            theirs = fs_utils.decode_text(theirs_b)
+            if ours is None or theirs is None:
+                return True  # binary/unreadable
+            theirs = fs_utils.apply_compiled_rules(theirs, compiled_rules)
+            # Distinct keys per thread; apply reuses this instead of
+            # re-reading + re-rendering the template side.
+            ctx.rendered_theirs[rel] = theirs
+            return ours != theirs
+
+        if len(merge_probes) > 4:
+            from concurrent.futures import ThreadPoolExecutor
+
+            workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # map preserves submission order: items stays deterministic
+                flags = list(
+                    pool.map(_diff_one, (rel for _, rel in merge_probes)),
                 )
+        else:
+            flags = [_diff_one(rel) for _, rel in merge_probes]
 
-        # Plan block-protection preview (consumer-side markers)
-        block_events = self._scan_block_protection(
-            getattr(lock, "managed_paths", []) or [],
-        )
+        for (idx, _), had_conflict in zip(merge_probes, flags):
+            items[idx].had_conflict = had_conflict
+            if had_conflict:
+                conflicts += 1
 
         return {
             "current_version": getattr(lock, "version", None),
@@ -211,10 +295,7 @@ class RetemplarCore:
                     "type": item.kind,
                     "note": item.note,
                     "had_conflict": item.had_conflict,
-                    "matched_rule": fs_utils.best_rule(
-                        item.path,
-                        getattr(lock, "managed_paths", []) or [],
-                    ).path,
+                    "matched_rule": item.matched_rule_path,
                 }
                 for item in items
             ],
@@ -235,102 +316,140 @@ class RetemplarCore:
         if not target_ref:
             raise ValueError("target_ref is required for apply")
 
-        plan = self.plan_upgrade(target_ref)
-        lock = self.lockfile_manager.read()
-        target_src = self.lockfile_manager._parse_template_ref(target_ref)  # type: ignore[attr-defined]
-        tpl_root = fs_utils.resolve_template_path(target_src.repo)
+        ctx = self._build_plan_context(target_ref)
+        plan = self._plan_from_context(ctx, target_ref)
+        lock = ctx.lock
+        target_src = ctx.target_src
+        tpl_root = ctx.tpl_root
 
         files_changed = 0
         conflicts = 0
-
-        for change in plan["changes"]:
+        # Dedupe parent mkdirs across the whole apply run.
+        created_dirs: set = set()
+        # Loop invariants: render rules, bound joinpath methods (skips
+        # Path.__truediv__ dispatch per iteration).
+        render_rules = getattr(lock, "render_rules", None)
+        compiled_rules = fs_utils.compile_rules(render_rules)
+        repo_p_join = self.repo_path.joinpath
+        tpl_p_join = tpl_root.joinpath
+
+        def _apply_one(change: Dict[str, Any]) -> Tuple[int, int]:
+            """Apply one non-delete change; returns (files_changed, conflicts)."""
             rel = change["file"]
             strat = change["strategy"]
             kind = change["type"]
 
-            repo_p = self.repo_path / rel
-            tpl_p = tpl_root / rel
+            repo_p = repo_p_join(rel)
 
             if strat == "preserve":
-                if kind == "create" and not repo_p.exists():
-                    if not dry_run:
-                        merge_utils.copy_with_render_and_blockprotect(
-                            tpl_p,
-                            repo_p,
-                            getattr(lock, "render_rules", None),
-                            self.repo_path,
-                        )
-                    files_changed += 1
-                continue
-
-            if strat == "enforce":
-                if kind in ("create", "overwrite"):
+                # kind == "create" already means "in template, not in repo":
+                # plan derived it from the walked file sets, so no extra
+                # exists() stat here.
+                if kind == "create":
                     if not dry_run:
                         merge_utils.copy_with_render_and_blockprotect(
-                            tpl_p,
+                            tpl_p_join(rel),
                             repo_p,
-                            getattr(lock, "render_rules", None),
+                            render_rules,
                             self.repo_path,
+                            created_dirs,
                         )
-                    files_changed += 1
-                elif kind == "delete":
-                    if not dry_run:
-                        fs_utils.delete_file(repo_p)
-                    files_changed += 1
-                continue
+                    return (1, 0)
+                return (0, 0)
 
-            # merge
-            if kind == "create":
+            if strat == "enforce" or kind == "create":
+                # enforce create/overwrite, or merge create
                 if not dry_run:
                     merge_utils.copy_with_render_and_blockprotect(
-                        tpl_p,
+                        tpl_p_join(rel),
                         repo_p,
-                        getattr(lock, "render_rules", None),
+                        render_rules,
                         self.repo_path,
+                        created_dirs,
                     )
-                files_changed += 1
-                continue
-
-            if kind == "delete":
-                if not dry_run:
-                    fs_utils.delete_file(repo_p)
-                files_changed += 1
-                continue
-
-            if kind == "edit":
-                ours = fs_utils.read_text(repo_p)
-                theirs = fs_utils.read_text(tpl_p)
+                return (1, 0)
+
+            # merge edit
+            cached_theirs = ctx.rendered_theirs.get(rel)
+            if cached_theirs is not None:
+                # Plan's probe already read + rendered the template side.
+                ours = fs_utils.decode_text(repo_p.read_bytes())
+                if ours is None:
+                    print(
+                        f"[WARN] binary merge unsupported: {rel} (kept local)",
+                    )
+                    return (0, 1)
+                theirs = cached_theirs
+            else:
+                # Read raw bytes once per side: identical files
+                # short-circuit on a byte compare (no decode), and differing
+                # files decode in memory instead of being read twice.
+                ours_b = repo_p.read_bytes()
+                theirs_b = tpl_p_join(rel).read_bytes()
+                if not render_rules and ours_b == theirs_b:
+                    return (0, 0)
+                ours = fs_utils.decode_text(ours_b)
+                theirs = fs_utils.decode_text(theirs_b)
                 if ours is None or theirs is None:
                     # binary or unreadable → keep local, flag conflict
                     print(
                         f"[WARN] binary merge unsupported: {rel} (kept local)",
                     )
-                    conflicts += 1
-                    # do not overwrite; user can switch strategy to 'enforce' if desired
-                    continue
+                    # do not overwrite; user can switch strategy to 'enforce'
+                    return (0, 1)
 
-                theirs = fs_utils.apply_render_rules_text(
+                theirs = fs_utils.apply_compiled_rules(
                     theirs,
-                    getattr(lock, "render_rules", None),
+                    compiled_rules,
                 )
-                if ours == theirs:
-                    # No change → skip writing, no conflict
-                    continue
-
-                # 2-way conflict markers (MVP)
-                merged = merge_utils.merge_with_conflicts(ours, theirs)
-                # post-merge: enforce consumer-side ignore blocks
-                final, _report = enforce_ours_blocks(ours, merged)
-                if not dry_run:
-                    fs_utils.write_text(repo_p, final)
-                conflicts += 1
-                files_changed += 1
-                continue
-
-        # Best-effort lockfile update
+            if ours == theirs:
+                # No change → skip writing, no conflict
+                return (0, 0)
+
+            # 2-way conflict markers (MVP)
+            merged = merge_utils.merge_with_conflicts(ours, theirs)
+            # post-merge: enforce consumer-side ignore blocks
+            final, _report = enforce_ours_blocks(ours, merged)
+            if not dry_run:
+                fs_utils.write_text(repo_p, final, created_dirs)
+            return (1, 1)
+
+        # Writes target disjoint paths, so they parallelize safely; deletes
+        # run serially afterwards so their empty-parent pruning can't race a
+        # concurrent mkdir. Small plans stay serial (pool spin-up costs more
+        # than it saves).
+        write_ops = [c for c in plan["changes"] if c["type"] != "delete"]
+        delete_ops = [c for c in plan["changes"] if c["type"] == "delete"]
+
+        if len(write_ops) > 4 and not dry_run:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(
+                max_workers=min(32, os.cpu_count() or 1),
+            ) as pool:
+                results = list(pool.map(_apply_one, write_ops))
+        else:
+            results = [_apply_one(c) for c in write_ops]
+
+        for fc, cf in results:
+            files_changed += fc
+            conflicts += cf
+
+        # Deletes collect their parents and prune once at the end: a batch
+        # of deletes under one directory costs one rmdir attempt instead of
+        # a failed attempt per file while siblings still exist.
+        prune_dirs: set = set()
+        for change in delete_ops:
+            if not dry_run:
+                fs_utils.delete_file(repo_p_join(change["file"]), prune_dirs)
+            files_changed += 1
+        if prune_dirs:
+            fs_utils.prune_empty_dirs(prune_dirs)
+
+        # Best-effort lockfile update (reuse the lock parsed before the loop;
+        # nothing in the loop rewrites it on disk)
+        updated = None
         try:
-            lock = self.lockfile_manager.read()
-
             # bring template source forward to the target
             new_template = lock.template.model_copy(
                 update={
@@ -363,12 +482,15 @@ class RetemplarCore:
 
         except Exception:
             # non-fatal: keep changes on disk even if lock update fails
-            pass
+            updated = None
 
         return {
             "applied_version": target_ref,
             "files_changed": files_changed,
             "conflicts_resolved": conflicts,
+            # the lock as written (None if the update failed); callers can
+            # inspect it directly instead of re-reading the file
+            "lock": updated,
         }
 
     def detect_drift(self) -> Dict[str, Any]:
@@ -394,39 +516,3 @@ class RetemplarCore:
             "unmanaged_files": [],  # TODO: implement
         }
 
-    def _scan_block_protection(
-        self,
-        managed_rules: List[Any],
-    ) -> List[Dict[str, Any]]:
-        events: List[Dict[str, Any]] = []
-        ignore_patterns = (
-            getattr(self.lockfile_manager.read(), "ignore_paths", [])
-            if self.lockfile_manager.exists()
-            else []
-        )
-        for rel in sorted(set(fs_utils.list_files(self.repo_path))):
-            if any(fs_utils.match(rel, pat) for pat in ignore_patterns):
-                continue
-            rule = fs_utils.best_rule(rel, managed_rules)
-            if not rule:
-                continue
-            p = self.repo_path / rel
-            s = fs_utils.read_text(p)
-            if s is None:
-                continue
-            blocks = find_ignore_blocks(s)
-            if blocks:
-                events.append(
-                    {
-                        "file": rel,
-                        "blocks": [
-                            {
-                                "id": bid,
-                                "start": span.start + 1,
-                                "end": span.end + 1,
-                            }
-                            for bid, span in blocks.items()
-                        ],
-                    },
-                )
-        return events
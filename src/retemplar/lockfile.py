@@ -8,13 +8,19 @@ Simple read/write/validate operations for MVP RAT lockfiles.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import yaml
 from pydantic import ValidationError
 
+# libyaml-backed loader/dumper when the C extension is present (5-10x
+# faster parse); pure-Python safe variants otherwise. Same safety model.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 # NOTE: adjust import to your schema filename
 from .schema import RetemplarLock, TemplateSource, ManagedPath, RenderRule
 
@@ -39,6 +45,9 @@ class LockfileManager:
     def __init__(self, repo_root: Path):
         self.repo_root = Path(repo_root).resolve()
         self.lockfile_path = self.repo_root / self.LOCKFILE_NAME
+        # (mtime_ns, size) -> parsed lock. One command reads the lockfile
+        # several times (plan, apply, block scan); parse + validate once.
+        self._cache: Optional[Tuple[Tuple[int, int], RetemplarLock]] = None
 
     # ------------------------
     # Basic ops
@@ -48,18 +57,30 @@ class LockfileManager:
         return self.lockfile_path.exists()
 
     def read(self) -> RetemplarLock:
-        """Read and parse lockfile."""
-        if not self.exists():
+        """Read and parse lockfile.
+
+        Cached on (mtime_ns, size): repeated reads within one invocation
+        skip the YAML parse and pydantic validation. The returned model is
+        shared, so treat it as read-only (use model_copy to derive updates).
+        """
+        try:
+            st = os.stat(self.lockfile_path)
+        except FileNotFoundError:
             raise LockfileNotFoundError(
                 f"Lockfile not found at {self.lockfile_path}",
-            )
+            ) from None
+        stamp = (st.st_mtime_ns, st.st_size)
+        if self._cache is not None and self._cache[0] == stamp:
+            return self._cache[1]
 
         try:
             content = self.lockfile_path.read_text(encoding="utf-8")
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=_YAML_LOADER)
             if data is None:
                 raise LockfileValidationError("Lockfile is empty.")
-            return RetemplarLock.model_validate(data)
+            lock = RetemplarLock.model_validate(data)
+            self._cache = (stamp, lock)
+            return lock
         except yaml.YAMLError as e:
             raise LockfileValidationError(
                 f"Invalid YAML in lockfile: {e}",
@@ -80,16 +101,10 @@ class LockfileManager:
 
         self.lockfile_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Dump as YAML (safe_dump, stable order off for readability)
         payload = lock.model_dump(by_alias=True, exclude_none=True)
-        content = yaml.safe_dump(
-            payload,
-            default_flow_style=False,
-            sort_keys=False,
-            allow_unicode=True,
-        )
 
-        # Atomic replace dance
+        # Atomic replace dance; YAML is emitted straight into the temp file
+        # (no intermediate document string).
         tmp_dir = self.lockfile_path.parent
         with NamedTemporaryFile(
             "w",
@@ -100,7 +115,14 @@ class LockfileManager:
             encoding="utf-8",
         ) as tf:
             tmp_name = tf.name
-            tf.write(content)
+            yaml.dump(
+                payload,
+                tf,
+                Dumper=_YAML_DUMPER,
+                default_flow_style=False,
+                sort_keys=False,
+                allow_unicode=True,
+            )
             tf.flush()
             os.fsync(tf.fileno())
 
@@ -109,6 +131,7 @@ class LockfileManager:
                 tmp_name,
                 self.lockfile_path,
             )  # atomic on same filesystem
+            self._cache = None  # next read re-stats the new file
             # fsync the directory to persist the rename on POSIX
             dir_fd = os.open(tmp_dir, os.O_DIRECTORY)
             try:
@@ -124,16 +147,13 @@ class LockfileManager:
             raise LockfileError(f"Failed to write lockfile: {e}") from e
 
     def validate(self, lock: RetemplarLock) -> List[str]:
-        """Validate lockfile and return list of error messages."""
+        """Validate lockfile and return list of error messages.
+
+        A RetemplarLock instance was already validated by pydantic on
+        construction, so no dump/reparse round-trip here — only the
+        business rules pydantic doesn't express.
+        """
         errs: List[str] = []
-        try:
-            # Pydantic roundtrip check
-            RetemplarLock.model_validate(lock.model_dump())
-        except ValidationError as e:
-            for error in e.errors():
-                errs.append(
-                    f"{'.'.join(map(str, error.get('loc', [])))}: {error.get('msg')}",
-                )
 
         # Business rules: duplicate managed paths (shouldn’t happen due to schema dedupe but double-check)
         seen = set()
@@ -195,36 +215,49 @@ class LockfileManager:
           - rat:/abs/path@vX
           - rat:./template-dir           (defaults ref='local')
         """
-        if not template_ref.startswith("rat:"):
+        repo, ref = _split_rat_ref(template_ref)
+        # A fresh model per call: TemplateSource is mutable and gets
+        # embedded into locks, so only the string split is shared.
+        return TemplateSource(repo=repo, ref=ref)
+
+
+@lru_cache(maxsize=128)
+def _split_rat_ref(template_ref: str) -> Tuple[str, str]:
+    """Validate a 'rat:...' reference and split it into (repo, ref).
+
+    Cached on the raw string: one command parses the same ref several
+    times (adopt, plan, apply). Error cases raise and are not cached.
+    """
+    if not template_ref.startswith("rat:"):
+        raise LockfileError(
+            f"MVP only supports RAT templates: {template_ref}",
+        )
+
+    ref_part = template_ref[4:]  # strip 'rat:'
+
+    # If explicit @ref present, split it
+    if "@" in ref_part:
+        repo, ref = ref_part.rsplit("@", 1)
+        if not repo:
             raise LockfileError(
-                f"MVP only supports RAT templates: {template_ref}",
+                f"Invalid RAT template (empty repo): {template_ref}",
             )
-
-        ref_part = template_ref[4:]  # strip 'rat:'
-
-        # If explicit @ref present, split it
-        if "@" in ref_part:
-            repo, ref = ref_part.rsplit("@", 1)
-            if not repo:
-                raise LockfileError(
-                    f"Invalid RAT template (empty repo): {template_ref}",
-                )
-            if not ref:
-                raise LockfileError(
-                    f"Invalid RAT template (empty ref): {template_ref}",
-                )
-            return TemplateSource(repo=repo, ref=ref)
-
-        # No @ref: must be a local path; default ref label
-        if ref_part.startswith(("./", "/")) or (
-            ref_part.startswith(".") and "/" in ref_part
-        ):
-            return TemplateSource(repo=ref_part, ref="local")
-
-        # GitHub without @ is ambiguous; require explicit ref
-        if ref_part.startswith("gh:"):
+        if not ref:
             raise LockfileError(
-                f"GitHub RAT template ref must include @version: {template_ref}",
+                f"Invalid RAT template (empty ref): {template_ref}",
             )
+        return repo, ref
+
+    # No @ref: must be a local path; default ref label
+    if ref_part.startswith(("./", "/")) or (
+        ref_part.startswith(".") and "/" in ref_part
+    ):
+        return ref_part, "local"
+
+    # GitHub without @ is ambiguous; require explicit ref
+    if ref_part.startswith("gh:"):
+        raise LockfileError(
+            f"GitHub RAT template ref must include @version: {template_ref}",
+        )
 
-        raise LockfileError(f"Unsupported RAT template format: {template_ref}")
+    raise LockfileError(f"Unsupported RAT template format: {template_ref}")
@@ -23,6 +23,7 @@ from pydantic import (
     BaseModel,
     Field,
     ConfigDict,
+    PrivateAttr,
     field_validator,
     model_validator,
 )
@@ -71,12 +72,19 @@ class TemplateSource(BaseModel):
 
     @model_validator(mode="after")
     def _ensure_commit_if_sha(self) -> "TemplateSource":
-        # If ref looks like a 40/64-char hex, treat as commit
-        if self.commit is None and re.fullmatch(
-            r"[0-9a-fA-F]{40}|[0-9a-fA-F]{64}",
-            self.ref or "",
-        ):
-            self.commit = self.ref
+        # If ref looks like a 40/64-char hex, treat as commit.
+        # bytes.fromhex is a C-level char check; this validator fires on
+        # every lockfile read, so no regex engine here.
+        ref = self.ref or ""
+        # (fromhex skips ASCII whitespace between byte pairs; isalnum()
+        # rejects all of it C-side before the hex parse)
+        if self.commit is None and len(ref) in (40, 64) and ref.isalnum():
+            try:
+                bytes.fromhex(ref)
+            except ValueError:
+                pass
+            else:
+                self.commit = ref
         return self
 
 
@@ -98,8 +106,23 @@ class RenderRule(BaseModel):
     replacement: str
     literal: bool = False
 
+    # Compiled once at validation; every file rendered under this rule
+    # reuses the object instead of paying re.compile per call.
+    _compiled: Optional[re.Pattern] = PrivateAttr(default=None)
+
     model_config = ConfigDict(extra="forbid")
 
+    @model_validator(mode="after")
+    def _compile_pattern(self) -> "RenderRule":
+        if not self.literal:
+            try:
+                self._compiled = re.compile(self.pattern)
+            except re.error as e:
+                raise ValueError(
+                    f"Invalid regex pattern '{self.pattern}': {e}",
+                ) from e
+        return self
+
 
 class ManagedPath(BaseModel):
     """
@@ -159,25 +182,21 @@ class RetemplarLock(BaseModel):
     @field_validator("ignore_paths")
     @classmethod
     def _norm_ignores(cls, v: List[str]) -> List[str]:
-        seen = set()
-        out: List[str] = []
-        for p in v or []:
-            p2 = _posix(p.strip())
-            if p2 and p2 not in seen:
-                seen.add(p2)
-                out.append(p2)
-        return out
+        # dict.fromkeys: C-level, order-preserving dedup
+        return list(
+            dict.fromkeys(
+                p2 for p in v or [] if (p2 := _posix(p.strip()))
+            ),
+        )
 
     @model_validator(mode="after")
     def _dedupe_managed(self) -> "RetemplarLock":
-        # Deduplicate by path; keep the first occurrence
-        seen = set()
-        deduped: List[ManagedPath] = []
+        # Deduplicate by path, keeping the first occurrence: first-write-
+        # wins dict build at C speed instead of a Python set/append loop.
+        by_path = {}
         for r in self.managed_paths or []:
-            if r.path not in seen:
-                deduped.append(r)
-                seen.add(r.path)
-        self.managed_paths = deduped
+            by_path.setdefault(r.path, r)
+        self.managed_paths = list(by_path.values())
         return self
 
     @model_validator(mode="after")
@@ -64,7 +64,11 @@ def find_ignore_blocks(text: str) -> Dict[str, BlockSpan]:
       retemplar:end id=<id>
     Returns: {id: BlockSpan(start_line_idx, end_line_idx)} using 0-based indices.
     """
-    lines = text.splitlines(keepends=True)
+    return find_ignore_blocks_in_lines(text.splitlines(keepends=True))
+
+
+def find_ignore_blocks_in_lines(lines: List[str]) -> Dict[str, BlockSpan]:
+    """As find_ignore_blocks, for callers that already hold the split lines."""
     blocks: Dict[str, BlockSpan] = {}
     open_blocks: Dict[str, int] = {}  # id -> start_line_idx
 
@@ -3,10 +3,13 @@
 File system utilities for retemplar.
 """
 
+import mmap
+import os
 import re
-from fnmatch import fnmatch
+from fnmatch import translate as fnmatch_translate
+from functools import lru_cache
 from pathlib import Path, PurePosixPath
-from typing import Any, Iterable, Optional, List, Tuple
+from typing import Any, Iterable, Iterator, Optional, List, Tuple
 from ..schema import RenderRule
 
 
@@ -20,67 +23,286 @@ def posix(p: Path | str) -> str:
     return PurePosixPath(str(p)).as_posix()
 
 
+@lru_cache(maxsize=1024)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """Compiled, cached form of one fnmatch-style pattern."""
+    return re.compile(fnmatch_translate(pattern))
+
+
 def match(path: str, pattern: str) -> bool:
     """Glob match with basic '**' support."""
     path = posix(path)
     pattern = posix(pattern)
     if pattern.endswith("/**"):
         return path == pattern[:-3] or path.startswith(pattern[:-3] + "/")
-    return fnmatch(path, pattern)
+    return _compile_glob(pattern).match(path) is not None
 
 
-def best_rule(path: str, managed_rules: Iterable[Any]) -> Optional[Any]:
-    """Pick most specific managed rule for a path (exact > /** > *)."""
-    matches = [r for r in managed_rules if match(path, r.path)]
-    if not matches:
+def _rule_rank(rule: Any) -> Tuple[int, int]:
+    """Static specificity key: literal > /** dir glob > '*' glob > other."""
+    p = posix(rule.path)
+    if p.endswith("/**"):
+        return (1, -len(p))  # dir glob
+    if "*" in p:
+        return (2, -len(p))  # wildcard
+    if "?" in p or "[" in p:
+        return (3, -len(p))  # other (rare)
+    return (0, -len(p))  # literal: only ever matches its exact path
+
+
+def rank_rules(managed_rules: Iterable[Any]) -> List[Any]:
+    """Sort rules by specificity once so the first match wins thereafter."""
+    return sorted(managed_rules, key=_rule_rank)
+
+
+def _has_wildcard(pattern: str) -> bool:
+    return "*" in pattern or "?" in pattern or "[" in pattern
+
+
+def partition_rules(managed_rules: Iterable[Any]) -> Tuple[dict, List[Any]]:
+    """Split rules into an exact-path dict and a specificity-ordered glob list.
+
+    Literal rules outrank every glob, so lookup is exact.get(path) first,
+    then a first-match scan of the globs.
+    """
+    exact: dict = {}
+    globs: List[Any] = []
+    for r in rank_rules(managed_rules):
+        p = posix(r.path)
+        if _has_wildcard(p):
+            globs.append(r)
+        else:
+            exact.setdefault(p, r)
+    return exact, globs
+
+
+def partition_ignores(
+    ignore_patterns: List[str],
+) -> Tuple[frozenset, List[str]]:
+    """Split ignore patterns into exact paths (set) and globs (list)."""
+    exact = frozenset(p for p in ignore_patterns if not _has_wildcard(p))
+    globs = [p for p in ignore_patterns if _has_wildcard(p)]
+    return exact, globs
+
+
+def compile_ignore_globs(glob_patterns: List[str]) -> Optional[re.Pattern]:
+    """Combine glob ignore patterns into a single anchored alternation regex.
+
+    One C-level match replaces a Python loop over fnmatch calls; returns
+    None when there is nothing to compile. Same semantics as match():
+    'dir/**' covers the directory itself and everything below it.
+    """
+    if not glob_patterns:
         return None
+    parts = []
+    for pat in glob_patterns:
+        p = posix(pat)
+        if p.endswith("/**"):
+            parts.append(re.escape(p[:-3]) + r"(?:/.*)?\Z")
+        else:
+            parts.append(fnmatch_translate(p))
+    return re.compile("|".join(parts))
 
-    def key(r: Any) -> Tuple[int, int]:
+
+def compile_rule_matcher(ranked_glob_rules: List[Any]):
+    """Build a path -> rule callable from specificity-ranked glob rules.
+
+    All rule patterns are fused into one alternation regex with a named
+    group per rule; alternatives are tried in list order, so the first
+    (most specific) match wins exactly as in first_matching_rule, but via
+    one C-level match instead of a Python loop.
+    """
+    if not ranked_glob_rules:
+        return lambda path: None
+    parts = []
+    for i, r in enumerate(ranked_glob_rules):
         p = posix(r.path)
-        if p == posix(path):
-            return (0, -len(p))  # exact match, highest
         if p.endswith("/**"):
-            return (1, -len(p))  # dir glob
-        if "*" in p:
-            return (2, -len(p))  # wildcard
-        return (3, -len(p))  # other (rare)
+            body = re.escape(p[:-3]) + r"(?:/.*)?\Z"
+        else:
+            body = fnmatch_translate(p)
+        parts.append(f"(?P<r{i}>{body})")
+    combined = re.compile("|".join(parts))
+
+    def matcher(path: str) -> Optional[Any]:
+        m = combined.match(path)
+        if m is None:
+            return None
+        return ranked_glob_rules[int(m.lastgroup[1:])]  # type: ignore[index]
 
-    return sorted(matches, key=key)[0]
+    return matcher
 
 
-def list_files(root: Path) -> List[str]:
-    """All file paths under root (relative, POSIX)."""
-    if not root.exists():
-        return []
+def first_matching_rule(path: str, ranked_rules: Iterable[Any]) -> Optional[Any]:
+    """best_rule over rules already ordered by rank_rules."""
+    for r in ranked_rules:
+        if match(path, r.path):
+            return r
+    return None
 
-    files = []
-    for path in root.rglob("*"):
-        if path.is_file():
-            rel_path = path.relative_to(root)
-            files.append(posix(rel_path))
-    return files
+
+def best_rule(path: str, managed_rules: Iterable[Any]) -> Optional[Any]:
+    """Pick most specific managed rule for a path (exact > /** > *)."""
+    return first_matching_rule(path, rank_rules(managed_rules))
+
+
+def iter_files(
+    root: Path,
+    ignore_patterns: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """Yield all file paths under root (relative, POSIX), lazily.
+
+    Uses an explicit os.scandir stack instead of Path.rglob: dirent type info
+    is reused (no extra stat per entry) and symlinks are never followed.
+    Callers building a set consume this directly; no intermediate list.
+
+    'dir/**' entries in ignore_patterns prune whole subtrees at the
+    directory level, so e.g. node_modules/.git trees are never entered.
+    File-level patterns are still the caller's job.
+    """
+    root_str = str(root)
+    if not os.path.isdir(root_str):
+        return
+
+    # Walk output is POSIX by construction, and 'dir/**' prune patterns are
+    # normalized once here — the per-directory check is plain string
+    # compares, no PurePosixPath allocation per entry.
+    prune_bases = tuple(
+        posix(p)[:-3]
+        for p in (ignore_patterns or [])
+        if p.endswith("/**")
+    )
+    prune_prefixes = tuple(b + "/" for b in prune_bases)
+    prefix_len = len(root_str.rstrip(os.sep)) + 1
+    stack = [root_str]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if prune_bases:
+                            rel_dir = entry.path[prefix_len:]
+                            if os.sep != "/":
+                                rel_dir = rel_dir.replace(os.sep, "/")
+                            if rel_dir in prune_bases or rel_dir.startswith(
+                                prune_prefixes,
+                            ):
+                                continue
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        rel = entry.path[prefix_len:]
+                        yield rel.replace(os.sep, "/") if os.sep != "/" else rel
+        except OSError:
+            continue
+
+
+def list_files(
+    root: Path,
+    ignore_patterns: Optional[List[str]] = None,
+) -> List[str]:
+    """Materialized iter_files, for callers that want a list."""
+    return list(iter_files(root, ignore_patterns))
+
+
+# Sniff window for binary detection; NUL bytes don't appear in text files
+# (same heuristic git uses), so one small read classifies most binaries.
+_BINARY_SNIFF_BYTES = 1024
 
 
 def read_text(path: Path) -> Optional[str]:
-    """Return file contents as text, or None if binary."""
+    """Return file contents as text, or None if binary.
+
+    Binary files are rejected from the first KiB (NUL-byte sniff) before
+    any full read/decode, so a large asset costs one small read instead
+    of a whole-file read plus a doomed UTF-8 decode.
+    """
     try:
-        return path.read_text(encoding="utf-8")
+        with open(path, "rb") as f:
+            head = f.read(_BINARY_SNIFF_BYTES)
+            if b"\x00" in head:
+                return None
+            return (head + f.read()).decode("utf-8")
     except UnicodeDecodeError:
         return None
 
 
-def write_text(path: Path, text: str) -> None:
+def decode_text(data: bytes) -> Optional[str]:
+    """As read_text, for callers that already hold the raw bytes."""
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
+def files_equal(a: Path, b: Path) -> bool:
+    """Raw byte equality without copying file contents into userspace.
+
+    Both files are mmapped and compared through memoryviews (a C-level
+    compare over the page cache); size mismatch answers immediately.
+    Works on bytes, so binary files are fine.
+    """
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        if os.fstat(fa.fileno()).st_size != os.fstat(fb.fileno()).st_size:
+            return False
+        if os.fstat(fa.fileno()).st_size == 0:
+            return True
+        with (
+            mmap.mmap(fa.fileno(), 0, access=mmap.ACCESS_READ) as ma,
+            mmap.mmap(fb.fileno(), 0, access=mmap.ACCESS_READ) as mb,
+        ):
+            va, vb = memoryview(ma), memoryview(mb)
+            try:
+                return va == vb
+            finally:
+                va.release()
+                vb.release()
+
+
+def ensure_parent_dir(path: Path, created_dirs: Optional[set] = None) -> None:
+    """mkdir -p the parent, skipping the syscall when already seen."""
+    parent = path.parent
+    if created_dirs is not None and parent in created_dirs:
+        return
+    parent.mkdir(parents=True, exist_ok=True)
+    if created_dirs is not None:
+        created_dirs.add(parent)
+        created_dirs.update(parent.parents)
+
+
+def write_text(path: Path, text: str, created_dirs: Optional[set] = None) -> None:
     """Write text to path, creating directories as needed."""
-    path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(path, created_dirs)
     path.write_text(text, encoding="utf-8")
 
 
-def delete_file(path: Path) -> None:
-    if path.exists():
-        path.unlink()
-        # best-effort prune
+def delete_file(path: Path, prune_dirs: Optional[set] = None) -> None:
+    # EAFP: one unlink syscall instead of exists()+unlink.
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        return
+    if prune_dirs is not None:
+        # Caller batches pruning (see prune_empty_dirs): siblings deleted
+        # later in the same pass would make an rmdir here fail anyway.
+        prune_dirs.add(path.parent)
+        return
+    # best-effort prune
+    try:
+        os.rmdir(path.parent)
+    except OSError:
+        pass
+
+
+def prune_empty_dirs(dirs: set) -> None:
+    """Best-effort rmdir of collected parent directories, deepest first.
+
+    Deepest-first ordering means a directory whose only child was itself
+    just pruned gets its one rmdir attempt after, not before; non-empty
+    directories fail silently exactly as the inline prune did.
+    """
+    for d in sorted(dirs, key=lambda p: len(p.parts), reverse=True):
         try:
-            path.parent.rmdir()
+            os.rmdir(d)
         except OSError:
             pass
 
@@ -89,12 +311,55 @@ def is_ignored(rel: str, ignore_patterns: List[str]) -> bool:
     return any(match(rel, pat) for pat in ignore_patterns)
 
 
-def apply_render_rules_text(s: str, rules: Optional[List[RenderRule]]) -> str:
-    """Apply render rules to text content."""
-    if not rules:
-        return s
-    out = s
-    for r in rules:
+@lru_cache(maxsize=256)
+def compile_render_pattern(pattern: str) -> re.Pattern:
+    """Compile a render-rule regex once; repeated applies share the object."""
+    return re.compile(pattern)
+
+
+def _required_literal(pat: re.Pattern) -> Optional[str]:
+    """Longest literal substring every match of `pat` must contain.
+
+    Walks the compiled pattern's parse tree at top level: a run of
+    consecutive LITERAL nodes there is concatenated into the match
+    verbatim, so its text is a necessary substring. Returns None when
+    nothing usable is found (or under IGNORECASE, where literals aren't
+    case-exact). Used to skip re.sub on files the rule can't touch with
+    a single C-level `in` check.
+    """
+    if pat.flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = re._parser.parse(pat.pattern, pat.flags)
+    except Exception:
+        return None
+    best = ""
+    run: List[str] = []
+    for op, arg in parsed:
+        if op is re._parser.LITERAL:
+            run.append(chr(arg))
+        else:
+            if len(run) > len(best):
+                best = "".join(run)
+            run = []
+    if len(run) > len(best):
+        best = "".join(run)
+    return best or None
+
+
+def compile_rules(
+    rules: Optional[List[RenderRule]],
+) -> Tuple[Tuple[bool, Any, str, Optional[str]], ...]:
+    """Resolve rules into (literal, pattern-or-compiled, replacement,
+    required-substring) tuples.
+
+    Does the dict-or-model indirection, regex compilation, and
+    required-literal extraction once, so the per-file loop in
+    apply_compiled_rules is pure replace/sub calls behind a cheap `in`
+    prefilter.
+    """
+    compiled: List[Tuple[bool, Any, str, Optional[str]]] = []
+    for r in rules or []:
         # Support dict or object
         pattern = r.get("pattern") if isinstance(r, dict) else r.pattern
         replacement = r.get("replacement") if isinstance(r, dict) else r.replacement
@@ -104,15 +369,41 @@ def apply_render_rules_text(s: str, rules: Optional[List[RenderRule]]) -> str:
             else getattr(r, "literal", False)
         )
         if literal:
-            out = out.replace(pattern, replacement)
-        else:
+            # str.replace already scans once; no separate prefilter needed.
+            compiled.append((True, pattern, replacement, None))
+            continue
+        # RenderRule models carry their pattern precompiled; dict-shaped
+        # rules fall back to the shared compile cache.
+        pat = getattr(r, "_compiled", None)
+        if pat is None:
             try:
-                out = re.sub(pattern, replacement, out)
+                pat = compile_render_pattern(pattern)
             except re.error as e:
                 raise ValueError(
                     f"Invalid regex pattern '{pattern}': {e}",
                 ) from e
-    return out
+        compiled.append((False, pat, replacement, _required_literal(pat)))
+    return tuple(compiled)
+
+
+def apply_compiled_rules(
+    s: str,
+    compiled: Tuple[Tuple[bool, Any, str, Optional[str]], ...],
+) -> str:
+    """Apply pre-resolved render rules (see compile_rules) to text."""
+    for literal, pat, repl, required in compiled:
+        if literal:
+            s = s.replace(pat, repl)
+        elif required is None or required in s:
+            s = pat.sub(repl, s)
+    return s
+
+
+def apply_render_rules_text(s: str, rules: Optional[List[RenderRule]]) -> str:
+    """Apply render rules to text content."""
+    if not rules:
+        return s
+    return apply_compiled_rules(s, compile_rules(rules))
 
 
 # =============================================================================
@@ -120,11 +411,16 @@ def apply_render_rules_text(s: str, rules: Optional[List[RenderRule]]) -> str:
 # =============================================================================
 
 
+@lru_cache(maxsize=64)
 def resolve_template_path(template_repo: str) -> Path:
     """
     Local folder only:
       - "./template-dir", "/abs/path", ".<something>/..."
     GH refs still TODO (raise).
+
+    Cached per repo string: apply_changes resolves the same target twice
+    (once inside plan_upgrade), and .resolve() is a realpath syscall chain.
+    Failures raise and are not cached.
     """
     p = Path(template_repo)
     if p.exists() and p.is_dir():
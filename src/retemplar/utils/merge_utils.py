@@ -4,21 +4,25 @@ Clean, minimal merge utilities for retemplar.
 Implements "theirs as structural base" merge with ignore block support.
 """
 
+import bisect
 import difflib
 import shutil
+import sys
+from collections import Counter
 from pathlib import Path
 from typing import Optional, List
 
 from retemplar.schema import RenderRule
 from retemplar.utils.fs_utils import (
     apply_render_rules_text,
+    ensure_parent_dir,
     read_text,
     write_text,
 )
 
 from .blockprotect import (
     enforce_ours_blocks,
-    find_ignore_blocks,
+    find_ignore_blocks_in_lines,
 )
 
 
@@ -27,6 +31,7 @@ def copy_with_render_and_blockprotect(
     dst: Path,
     rules: Optional[List[RenderRule]],
     repo_root: Path,
+    created_dirs: Optional[set] = None,
 ) -> None:
     """Copy text/binary; apply render rules; then enforce consumer block protection."""
     try:
@@ -36,10 +41,14 @@ def copy_with_render_and_blockprotect(
             ours = read_text(dst)
             if ours is not None:
                 tpl, report = enforce_ours_blocks(ours, tpl)
-        write_text(dst, tpl)
+                if tpl == ours:
+                    # Destination already has exactly this content; skip
+                    # the write + copystat I/O.
+                    return
+        write_text(dst, tpl, created_dirs)
         shutil.copystat(src, dst, follow_symlinks=False)
     except UnicodeDecodeError:
-        dst.parent.mkdir(parents=True, exist_ok=True)
+        ensure_parent_dir(dst, created_dirs)
         shutil.copy2(src, dst)
 
 
@@ -50,9 +59,18 @@ def merge_with_conflicts(ours: str, theirs: str) -> str:
     - Ignore blocks from ours are auto-accepted
     - Other ours additions create conflicts
     """
-    ours_lines = ours.splitlines(keepends=True)
-    theirs_lines = theirs.splitlines(keepends=True)
-    ours_blocks = find_ignore_blocks(ours)
+    if ours == theirs:
+        # Identical inputs: no line split, no quadratic SequenceMatcher.
+        return ours
+
+    # Interned lines make SequenceMatcher's hash/equality work pointer
+    # comparisons for the many repeated lines ('\n', '}\n', indentation)
+    # a source file contains.
+    ours_lines = [sys.intern(l) for l in ours.splitlines(keepends=True)]
+    theirs_lines = [sys.intern(l) for l in theirs.splitlines(keepends=True)]
+    # Reuse the split we already paid for instead of re-splitting inside
+    # find_ignore_blocks.
+    ours_blocks = find_ignore_blocks_in_lines(ours_lines)
 
     if not ours_blocks:
         result_lines = _merge_simple(ours_lines, theirs_lines)
@@ -74,10 +92,122 @@ def _normalize_trailing_newline(result: str, template: str) -> str:
         return result.rstrip("\n")
 
 
+def _is_whitespace_line(line: str) -> bool:
+    return not line.strip()
+
+
+def _ensure_trailing_newline(lines: list[str]) -> None:
+    """Append a bare newline when the last emitted line lacks one.
+
+    Appending a separate "\\n" element is join-equivalent to the old
+    `lines[-1] += "\\n"` but skips re-copying the (possibly long) last
+    line; the suffix check is a single O(1) endswith.
+    """
+    if lines and lines[-1] and not lines[-1].endswith("\n"):
+        lines.append("\n")
+
+
+# Below this many lines the quadratic matcher is cheap enough that the
+# patience-anchor preprocessing isn't worth its bookkeeping.
+_PATIENCE_MIN_LINES = 200
+
+
+def _patience_anchors(
+    a: list[str],
+    b: list[str],
+) -> list[tuple[int, int]]:
+    """Index pairs of lines unique to both sides, in crossing-free order.
+
+    Classic patience-diff preprocessing: lines occurring exactly once on
+    each side are candidate anchors; the longest increasing subsequence
+    of their b-positions keeps the pairs mutually consistent.
+    """
+    counts_a = Counter(a)
+    counts_b = Counter(b)
+    pos_b = {
+        line: j
+        for j, line in enumerate(b)
+        if counts_b[line] == 1 and counts_a[line] == 1
+    }
+    pairs = [
+        (i, pos_b[line])
+        for i, line in enumerate(a)
+        if counts_a[line] == 1 and line in pos_b
+    ]
+    # pairs ascend in i; patience-sort LIS on j with parent links
+    tails: list[int] = []  # smallest tail j per pile
+    tails_idx: list[int] = []  # pair index holding each tail
+    parent = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        p = bisect.bisect_left(tails, j)
+        if p == len(tails):
+            tails.append(j)
+            tails_idx.append(k)
+        else:
+            tails[p] = j
+            tails_idx[p] = k
+        parent[k] = tails_idx[p - 1] if p > 0 else -1
+    if not tails:
+        return []
+    out = []
+    k = tails_idx[-1]
+    while k != -1:
+        out.append(pairs[k])
+        k = parent[k]
+    out.reverse()
+    return out
+
+
 def _merge_simple(ours_lines: list[str], theirs_lines: list[str]) -> list[str]:
     """Simple text merge with 'theirs as base' strategy."""
+    if ours_lines == theirs_lines:
+        return list(ours_lines)
+
+    # Large inputs: split at unique-line anchors first so the quadratic
+    # matcher only ever sees the (typically short) segments between them.
+    if (
+        len(ours_lines) >= _PATIENCE_MIN_LINES
+        and len(theirs_lines) >= _PATIENCE_MIN_LINES
+    ):
+        anchors = _patience_anchors(ours_lines, theirs_lines)
+        if anchors:
+            result = []
+            pi = pj = 0
+            for ai, bj in anchors:
+                result.extend(
+                    _merge_segment(
+                        ours_lines[pi:ai],
+                        theirs_lines[pj:bj],
+                    ),
+                )
+                result.append(ours_lines[ai])  # anchor: equal on both sides
+                pi, pj = ai + 1, bj + 1
+            result.extend(
+                _merge_segment(ours_lines[pi:], theirs_lines[pj:]),
+            )
+            return result
+
+    return _merge_segment(ours_lines, theirs_lines)
+
+
+def _merge_segment(
+    ours_lines: list[str],
+    theirs_lines: list[str],
+) -> list[str]:
+    """Opcode-driven merge of one segment (the pre-anchor code path)."""
+    if ours_lines == theirs_lines:
+        return list(ours_lines)
     result = []
-    sm = difflib.SequenceMatcher(None, ours_lines, theirs_lines)
+    # autojunk=False: the default "popular line" heuristic silently drops
+    # any line occurring in >1% of a 200+ line file (think '\n' or '}')
+    # and misaligns chunks. Whitespace-only lines are explicit junk
+    # instead, which also shrinks the matcher's b2j index.
+    sm = difflib.SequenceMatcher(
+        _is_whitespace_line,
+        ours_lines,
+        theirs_lines,
+        autojunk=False,
+    )
 
     for tag, i1, i2, j1, j2 in sm.get_opcodes():
         if tag == "equal":
@@ -114,7 +244,17 @@ def _merge_with_blocks(
 ) -> list[str]:
     """Merge with ignore block awareness."""
     result = []
-    sm = difflib.SequenceMatcher(None, ours_lines, theirs_lines)
+    # Blocks are non-overlapping, so sorting by start sorts ends too;
+    # overlap lookups below become bisect + short walk instead of a scan
+    # of every block per opcode.
+    sorted_blocks = sorted(blocks.items(), key=lambda kv: kv[1].start)
+    block_ends = [span.end for _, span in sorted_blocks]
+    sm = difflib.SequenceMatcher(
+        _is_whitespace_line,
+        ours_lines,
+        theirs_lines,
+        autojunk=False,
+    )
 
     for tag, i1, i2, j1, j2 in sm.get_opcodes():
         if tag == "equal":
@@ -122,7 +262,12 @@ def _merge_with_blocks(
         else:
             ours_chunk = ours_lines[i1:i2]
             theirs_chunk = theirs_lines[j1:j2]
-            overlapping = _find_overlapping_blocks(i1, i2, blocks)
+            overlapping = _find_overlapping_blocks(
+                i1,
+                i2,
+                sorted_blocks,
+                block_ends,
+            )
 
             if not overlapping:
                 result.extend(_merge_simple(ours_chunk, theirs_chunk))
@@ -139,13 +284,23 @@ def _merge_with_blocks(
     return result
 
 
-def _find_overlapping_blocks(start: int, end: int, blocks: dict) -> list:
-    """Find blocks overlapping with line range [start, end)."""
-    return [
-        (bid, span)
-        for bid, span in blocks.items()
-        if span.start < end and span.end >= start
-    ]
+def _find_overlapping_blocks(
+    start: int,
+    end: int,
+    sorted_blocks: list,
+    block_ends: list,
+) -> list:
+    """Find blocks overlapping line range [start, end).
+
+    sorted_blocks is (id, span) pairs ordered by span.start with the
+    parallel block_ends array; O(log B + overlaps) per call.
+    """
+    i = bisect.bisect_left(block_ends, start)
+    out = []
+    while i < len(sorted_blocks) and sorted_blocks[i][1].start < end:
+        out.append(sorted_blocks[i])
+        i += 1
+    return out
 
 
 def _split_around_blocks(
@@ -156,41 +311,36 @@ def _split_around_blocks(
 ) -> list[str]:
     """Split chunk around ignore blocks, auto-accepting blocks."""
     result = []
-    pos = start_line
+    ours_len = len(ours_chunk)
+    theirs_len = len(theirs_chunk)
+    # Single cursor into the chunk (old code recomputed pos - start_line
+    # per slice); overlapping is already (id, span) sorted by span.start.
+    off = 0
 
     for block_id, span in sorted(overlapping, key=lambda x: x[1].start):
+        block_off = span.start - start_line
         # Handle content before block
-        if pos < span.start:
-            pre_ours = ours_chunk[pos - start_line : span.start - start_line]
-            pre_theirs = (
-                theirs_chunk[pos - start_line : span.start - start_line]
-                if len(theirs_chunk) > (pos - start_line)
-                else []
-            )
+        if off < block_off:
+            pre_ours = ours_chunk[off:block_off]
+            pre_theirs = theirs_chunk[off:block_off] if theirs_len > off else []
             if pre_ours or pre_theirs:
                 result.extend(_merge_simple(pre_ours, pre_theirs))
 
         # Auto-accept ignore block (with proper separation)
-        block_start = max(0, span.start - start_line)
-        block_end = min(len(ours_chunk), span.end + 1 - start_line)
-        block_lines = ours_chunk[block_start:block_end]
-
+        block_lines = ours_chunk[
+            max(0, block_off) : min(ours_len, span.end + 1 - start_line)
+        ]
         if block_lines:
             # Ensure newline separation before ignore blocks
-            if result and result[-1] and not result[-1].endswith("\n"):
-                result[-1] += "\n"
+            _ensure_trailing_newline(result)
             result.extend(block_lines)
 
-        pos = span.end + 1
+        off = span.end + 1 - start_line
 
     # Handle remaining content after last block
-    if pos < start_line + len(ours_chunk):
-        post_ours = ours_chunk[pos - start_line :]
-        post_theirs = (
-            theirs_chunk[pos - start_line :]
-            if len(theirs_chunk) > (pos - start_line)
-            else []
-        )
+    if off < ours_len:
+        post_ours = ours_chunk[off:]
+        post_theirs = theirs_chunk[off:] if theirs_len > off else []
         if post_ours or post_theirs:
             result.extend(_merge_simple(post_ours, post_theirs))
 
@@ -204,18 +354,12 @@ def _create_conflict(
     """Create conflict markers with proper newline handling."""
     conflict = ["<<<<<<< LOCAL\n"]
     conflict.extend(ours_chunk)
-
     # Ensure newline before separator
-    if conflict and not conflict[-1].endswith("\n"):
-        conflict[-1] += "\n"
-
+    _ensure_trailing_newline(conflict)
     conflict.append("=======\n")
     conflict.extend(theirs_chunk)
-
     # Ensure newline before end marker
-    if conflict and not conflict[-1].endswith("\n"):
-        conflict[-1] += "\n"
-
+    _ensure_trailing_newline(conflict)
     conflict.append(">>>>>>> TEMPLATE\n")
     return conflict
 
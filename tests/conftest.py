@@ -0,0 +1,39 @@
+"""Shared fixtures for the test suite."""
+
+from pathlib import Path
+
+import pytest
+
+# Canonical template tree for plan/apply tests. Built once per session
+# (see shared_template); tests only ever read it via a rat: ref.
+# Content is pre-encoded so materialize_tree writes bytes straight
+# through without a per-file UTF-8 encode.
+_TEMPLATE_FILES = {
+    "config.yaml": b"template: config\nversion: 2.0",
+    "src/main.py": b"# Template main file",
+}
+
+
+def materialize_tree(root: Path, files: dict) -> None:
+    """Write a {relpath: content-bytes} tree under root in one sweep.
+
+    Unique parent directories are created once up front (one mkdir per
+    directory instead of one per file), then the files are written.
+    """
+    paths = {rel: root / rel for rel in files}
+    for parent in {p.parent for p in paths.values()}:
+        parent.mkdir(parents=True, exist_ok=True)
+    for rel, p in paths.items():
+        p.write_bytes(files[rel])
+
+
+@pytest.fixture(scope="session")
+def shared_template(tmp_path_factory) -> Path:
+    """Read-only template directory shared across the whole session.
+
+    Tests adopt this tree by reference and write only into their own
+    per-test repo dir, so one mkdir/write pass serves every test.
+    """
+    template_dir = tmp_path_factory.mktemp("template")
+    materialize_tree(template_dir, _TEMPLATE_FILES)
+    return template_dir
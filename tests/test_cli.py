@@ -1,18 +1,16 @@
 """Tests for CLI commands."""
 
 import pytest
-import tempfile
-from pathlib import Path
 from typer.testing import CliRunner
 
 from retemplar.cli import app
+from retemplar.lockfile import LockfileManager
 
 
 @pytest.fixture
-def temp_repo():
-    """Create temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_repo(tmp_path):
+    """Per-test directory from pytest's basetemp (no rmtree on teardown)."""
+    return tmp_path
 
 
 @pytest.fixture
@@ -56,6 +54,26 @@ def test_drift_command_help(runner):
     assert "Report drift between" in result.stdout
 
 
+def test_apply_dry_run_prints_json(runner, shared_template, temp_repo):
+    """Test apply --dry-run prints a JSON preview and exits cleanly."""
+    template_ref = f"rat:{shared_template}"
+    manager = LockfileManager(temp_repo)
+    lock = manager.create_adoption_lock(
+        template_ref=template_ref,
+        managed_paths=["config.yaml"],
+    )
+    manager.write(lock)
+
+    result = runner.invoke(
+        app,
+        ["--repo", str(temp_repo), "apply", "--to", template_ref, "--dry-run"],
+    )
+
+    assert result.exit_code == 0
+    assert '"files_changed"' in result.stdout
+    assert '"applied_ref"' in result.stdout
+
+
 def test_global_verbose_option(runner, temp_repo):
     """Test global verbose option."""
     result = runner.invoke(
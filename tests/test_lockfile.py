@@ -1,7 +1,6 @@
 """Tests for lockfile manager operations."""
 
 import pytest
-import tempfile
 from pathlib import Path
 
 from retemplar.lockfile import (
@@ -11,10 +10,9 @@ from retemplar.lockfile import (
 
 
 @pytest.fixture
-def temp_repo():
-    """Create temporary directory for testing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+def temp_repo(tmp_path):
+    """Per-test directory from pytest's basetemp (no rmtree on teardown)."""
+    return tmp_path
 
 
 def test_lockfile_manager_initialization(temp_repo):
@@ -38,37 +36,33 @@ def test_read_nonexistent_lockfile_raises_error(temp_repo):
         manager.read()
 
 
-def test_create_adoption_lock_rat():
-    """Test creating adoption lockfile for RAT template."""
-    manager = LockfileManager(Path("/tmp"))  # Dummy path for testing
+# Ref parsing and validation never touch repo_root; one dummy-rooted
+# manager serves every test that doesn't hit the disk.
+_REF_MANAGER = LockfileManager(Path("/tmp"))
 
-    lock = manager.create_adoption_lock("rat:gh:acme/main-svc@v2025.08.01")
-
-    assert lock.template.kind == "rat"
-    assert lock.template.repo == "gh:acme/main-svc"
-    assert lock.template.ref == "v2025.08.01"
-    assert lock.version == "rat@v2025.08.01"
-    assert lock.applied_ref == "v2025.08.01"
-
-
-def test_create_adoption_lock_local():
-    """Test creating adoption lockfile for local RAT template."""
-    manager = LockfileManager(Path("/tmp"))
 
-    lock = manager.create_adoption_lock("rat:/path/to/template@main")
+@pytest.mark.parametrize(
+    ("template_ref", "repo", "ref"),
+    [
+        ("rat:gh:acme/main-svc@v2025.08.01", "gh:acme/main-svc", "v2025.08.01"),
+        ("rat:/path/to/template@main", "/path/to/template", "main"),
+    ],
+)
+def test_create_adoption_lock(template_ref, repo, ref):
+    """Test creating adoption lockfiles for RAT template refs."""
+    lock = _REF_MANAGER.create_adoption_lock(template_ref)
 
     assert lock.template.kind == "rat"
-    assert lock.template.repo == "/path/to/template"
-    assert lock.template.ref == "main"
-    assert lock.version == "rat@main"
+    assert lock.template.repo == repo
+    assert lock.template.ref == ref
+    assert lock.version == f"rat@{ref}"
+    assert lock.applied_ref == ref
 
 
 def test_invalid_template_ref_format():
     """Test invalid template reference format."""
-    manager = LockfileManager(Path("/tmp"))
-
     with pytest.raises(Exception, match="MVP only supports RAT templates"):
-        manager.create_adoption_lock("pack:python-service@1.0.0")
+        _REF_MANAGER.create_adoption_lock("pack:python-service@1.0.0")
 
 
 def test_write_and_read_lockfile(temp_repo):
@@ -91,11 +85,9 @@ def test_write_and_read_lockfile(temp_repo):
 
 def test_validate_lockfile():
     """Test lockfile validation."""
-    manager = LockfileManager(Path("/tmp"))
-
     # Create valid lockfile
-    lock = manager.create_adoption_lock("rat:gh:acme/main-svc@v2025.08.01")
-    errors = manager.validate(lock)
+    lock = _REF_MANAGER.create_adoption_lock("rat:gh:acme/main-svc@v2025.08.01")
+    errors = _REF_MANAGER.validate(lock)
     assert len(errors) == 0
 
     # Create invalid lockfile (this would need more specific validation logic)